@@ -1,123 +1,96 @@
 import sys
 import re
-from enum import Enum
 import getopt
-import xml.dom.minidom
-
-class OperandTypes(Enum):
-    VAR = "var"
-    SYMB = "symb"
-    TYPE = "type"
-    LABEL = "label"
-
-class ErrorCodes(Enum):
-    ERR_PARAMETER = 10
-    ERR_INPUT = 11
-    ERR_OUTPUT = 12
-    ERR_HEADER = 21
-    ERR_SRC_CODE = 22
-    ERR_SYNTAX = 23
-    ERR_INTERNAL = 99
-    EXIT_SUCCESS = 0
+
+from opcodes import CODE_COMMANDS, E_ARG_TYPE
+
+# Regular expressions used by the validators and the formatter, compiled once at import
+INT_REGEX = re.compile(r"^(([-+]?\d+)|(0[oO]?[0-7]+)|(0[xX][0-9a-fA-F]+))$")
+BOOL_REGEX = re.compile(r"^(true|false)$")
+NIL_REGEX = re.compile(r"^nil$")
+STRING_REGEX = re.compile(r"^(?:[^\\#\s]|\\\d{3})*$")
+LABEL_REGEX = re.compile(r"^[a-zA-Z_\-$&%*!?][\w\-$&%*!?]*$")
+EMPTY_REGEX = re.compile(r"^\s*$")
+# Matchers of the literal of each constant type
+LITERAL_MATCHERS = {
+    "int": INT_REGEX.match,
+    "bool": BOOL_REGEX.match,
+    "nil": NIL_REGEX.match,
+    "string": STRING_REGEX.match,
+}
+# Header of the source code, compared case-insensitively
+HEADER = ".ippcode23"
+# Frames of variables and names of types
+FRAMES = frozenset(("GF", "TF", "LF"))
+TYPE_NAMES = frozenset(("int", "bool", "string", "nil"))
+# Translation table escaping characters that are not allowed in XML text
+XML_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
+# Operand types, the same interned strings as in the shared opcode table
+OP_VAR = E_ARG_TYPE.VAR
+OP_SYMB = E_ARG_TYPE.SYMB
+OP_TYPE = E_ARG_TYPE.TYPE
+OP_LABEL = E_ARG_TYPE.LABEL
+
+# Exit codes
+ERR_PARAMETER = 10
+ERR_INPUT = 11
+ERR_OUTPUT = 12
+ERR_HEADER = 21
+ERR_SRC_CODE = 22
+ERR_SYNTAX = 23
+ERR_INTERNAL = 99
+EXIT_SUCCESS = 0
+
+# Names of the error codes shown in error messages
+ERROR_NAMES = {
+    ERR_PARAMETER: "ERR_PARAMETER",
+    ERR_INPUT: "ERR_INPUT",
+    ERR_OUTPUT: "ERR_OUTPUT",
+    ERR_HEADER: "ERR_HEADER",
+    ERR_SRC_CODE: "ERR_SRC_CODE",
+    ERR_SYNTAX: "ERR_SYNTAX",
+    ERR_INTERNAL: "ERR_INTERNAL",
+}
 
 class ErrorHandler:
     @staticmethod
     def exit_with_error(err_code, message):
-        sys.stderr.write(f"\033[31m[{err_code.name}]\033[0m {message}({err_code.value}) \n")
-        sys.exit(err_code.value)
+        sys.stderr.write(f"\033[31m[{ERROR_NAMES[err_code]}]\033[0m {message}({err_code}) \n")
+        sys.exit(err_code)
 
 class Validators:
     @staticmethod
     def is_header(line):
-        return line is not None and line.lower() == ".ippcode23"
+        return line is not None and len(line) == len(HEADER) and line.lower() == HEADER
 
     @staticmethod
     def is_var(var):
-        if "@" not in var:
-            return False
-        frame, name = var.split("@")
-        if frame not in ["GF", "TF", "LF"]:
+        frame, separator, name = var.partition("@")
+        if not separator or frame not in FRAMES:
             return False
         return Validators.is_label(name)
 
     @staticmethod
     def is_symb(symb):
-        if "@" not in symb:
+        type, separator, literal = symb.partition("@")
+        if not separator:
             return False
-        type, literal = symb.split("@")
-        if not Validators.is_type(type):
+        matcher = LITERAL_MATCHERS.get(type)
+        if matcher is None:
             return Validators.is_var(symb)
-        if type == "int":
-            return bool(re.match(r"^(([-+]?\d+)|(0[oO]?[0-7]+)|(0[xX][0-9a-fA-F]+))$", literal))
-        elif type == "bool":
-            return bool(re.match(r"^(true|false)$", literal))
-        elif type == "nil":
-            return bool(re.match(r"^nil$", literal))
-        elif type == "string":
-            return not bool(re.match(r"^.*(\\\\(?!\d\d\d)).*$/u", literal))
-        return True
+        return matcher(literal) is not None
 
     @staticmethod
     def is_type(type):
-        return bool(re.match(r"^(int|bool|string|nil)$", type))
+        return type in TYPE_NAMES
 
     @staticmethod
     def is_label(label):
-        return bool(re.match(r"^[a-zA-Z_\-$&%*!?][\w\-$&%*!?]*$", label))
+        return bool(LABEL_REGEX.match(label))
 
-class InstructionRule:
-    def __init__(self, *operand_types):
-        self.operands = list(operand_types)
-
-    def get_operands(self):
-        return self.operands
-
-    def has_no_operands(self):
-        return not bool(self.operands)
-
-INSTRUCTION_RULES = {
-    "move": InstructionRule(OperandTypes.VAR, OperandTypes.SYMB),
-    "createframe": InstructionRule(),
-    "pushframe": InstructionRule(),
-    "popframe": InstructionRule(),
-    "defvar": InstructionRule(OperandTypes.VAR),
-    "call": InstructionRule(OperandTypes.LABEL),
-    "return": InstructionRule(),
-
-    "pushs": InstructionRule(OperandTypes.SYMB),
-    "pops": InstructionRule(OperandTypes.VAR),
-    "add": InstructionRule(OperandTypes.VAR, OperandTypes.SYMB, OperandTypes.SYMB),
-    "sub": InstructionRule(OperandTypes.VAR, OperandTypes.SYMB, OperandTypes.SYMB),
-    "mul": InstructionRule(OperandTypes.VAR, OperandTypes.SYMB, OperandTypes.SYMB),
-    "idiv": InstructionRule(OperandTypes.VAR, OperandTypes.SYMB, OperandTypes.SYMB),
-    "lt": InstructionRule(OperandTypes.VAR, OperandTypes.SYMB, OperandTypes.SYMB),
-    "gt": InstructionRule(OperandTypes.VAR, OperandTypes.SYMB, OperandTypes.SYMB),
-    "eq": InstructionRule(OperandTypes.VAR, OperandTypes.SYMB, OperandTypes.SYMB),
-    "and": InstructionRule(OperandTypes.VAR, OperandTypes.SYMB, OperandTypes.SYMB),
-    "or": InstructionRule(OperandTypes.VAR, OperandTypes.SYMB, OperandTypes.SYMB),
-    "not": InstructionRule(OperandTypes.VAR, OperandTypes.SYMB),
-    "int2char": InstructionRule(OperandTypes.VAR, OperandTypes.SYMB),
-    "stri2int": InstructionRule(OperandTypes.VAR, OperandTypes.SYMB, OperandTypes.SYMB),
-
-    "read": InstructionRule(OperandTypes.VAR, OperandTypes.TYPE),
-    "write": InstructionRule(OperandTypes.SYMB),
-
-    "concat": InstructionRule(OperandTypes.VAR, OperandTypes.SYMB, OperandTypes.SYMB),
-    "strlen": InstructionRule(OperandTypes.VAR, OperandTypes.SYMB),
-    "getchar": InstructionRule(OperandTypes.VAR, OperandTypes.SYMB, OperandTypes.SYMB),
-    "setchar": InstructionRule(OperandTypes.VAR, OperandTypes.SYMB, OperandTypes.SYMB),
-
-    "type": InstructionRule(OperandTypes.VAR, OperandTypes.SYMB),
-
-    "label": InstructionRule(OperandTypes.LABEL),
-    "jump": InstructionRule(OperandTypes.LABEL),
-    "jumpifeq": InstructionRule(OperandTypes.LABEL, OperandTypes.SYMB, OperandTypes.SYMB),
-    "jumpifneq": InstructionRule(OperandTypes.LABEL, OperandTypes.SYMB, OperandTypes.SYMB),
-    "exit": InstructionRule(OperandTypes.SYMB),
-
-    "dprint": InstructionRule(OperandTypes.SYMB),
-    "break": InstructionRule(),
-}
+# IPPcode23 has the same instruction set, only the opcodes are matched in lower case
+INSTRUCTION_RULES = {opcode.lower(): operand_types for opcode, operand_types in CODE_COMMANDS.items()}
 
 class Formatter:
     @staticmethod
@@ -137,14 +110,11 @@ class Formatter:
 
     @staticmethod
     def remove_comments(line):
-        cut_line = line.find("#")
-        if cut_line == -1:
-            return line.strip()
-        return line[:cut_line].strip()
+        return line.partition("#")[0].strip()
 
     @staticmethod
     def remove_empty(line):
-        if re.match(r"^\s*$", line):
+        if EMPTY_REGEX.match(line):
             return None
         return line
 
@@ -153,10 +123,8 @@ class InputReader(Formatter):
         self.input = []
 
     def get_input(self):
-        while True:
-            line = sys.stdin.readline()
-            if not line:
-                break
+        # Read the whole input at once instead of line by line
+        for line in sys.stdin.read().split("\n"):
             formatted_line = self.format_line(line)
             if formatted_line is not None:
                 self.input.append(formatted_line)
@@ -164,47 +132,43 @@ class InputReader(Formatter):
 
 class Operand:
     def __init__(self, operand, type):
-        if type == OperandTypes.SYMB:
+        if type == OP_SYMB:
             if Validators.is_var(operand):
                 self.type, self.value = "var", operand
             elif Validators.is_symb(operand):
-                self.type, self.value = operand.split("@")
+                self.type, _, self.value = operand.partition("@")
             else:
                 pass
         else:
-            self.type = type.value
+            self.type = type
             self.value = operand
 
 class Instruction:
-    general_order = 1
-
-    def __init__(self, destructured_line):
+    def __init__(self, destructured_line, order):
+        self.order = order
         self.name = destructured_line.pop(0).lower()
         self.operands = []
 
-        if self.name not in INSTRUCTION_RULES:
-            ErrorHandler.exit_with_error(ErrorCodes.ERR_SRC_CODE, "instruction does not exist")
+        operand_types = INSTRUCTION_RULES.get(self.name)
 
-        instruction_rule = INSTRUCTION_RULES[self.name]
+        if operand_types is None:
+            ErrorHandler.exit_with_error(ERR_SRC_CODE, "instruction does not exist")
 
-        if len(destructured_line) != len(instruction_rule.get_operands()):
-            ErrorHandler.exit_with_error(ErrorCodes.ERR_SYNTAX, "Invalid number of operands")
+        if len(destructured_line) != len(operand_types):
+            ErrorHandler.exit_with_error(ERR_SYNTAX, "Invalid number of operands")
 
-        for key, operand in enumerate(instruction_rule.get_operands()):
-            if operand == OperandTypes.VAR and not Validators.is_var(destructured_line[key]):
-                ErrorHandler.exit_with_error(ErrorCodes.ERR_SYNTAX, "Invalid variable")
-            if operand == OperandTypes.SYMB and not Validators.is_symb(destructured_line[key]):
-                ErrorHandler.exit_with_error(ErrorCodes.ERR_SYNTAX, "Invalid constant")
-            if operand == OperandTypes.TYPE and not Validators.is_type(destructured_line[key]):
-                ErrorHandler.exit_with_error(ErrorCodes.ERR_SYNTAX, "Invalid type")
-            if operand == OperandTypes.LABEL and not Validators.is_label(destructured_line[key]):
-                ErrorHandler.exit_with_error(ErrorCodes.ERR_SYNTAX, "Invalid label")
+        for key, operand in enumerate(operand_types):
+            if operand == OP_VAR and not Validators.is_var(destructured_line[key]):
+                ErrorHandler.exit_with_error(ERR_SYNTAX, "Invalid variable")
+            if operand == OP_SYMB and not Validators.is_symb(destructured_line[key]):
+                ErrorHandler.exit_with_error(ERR_SYNTAX, "Invalid constant")
+            if operand == OP_TYPE and not Validators.is_type(destructured_line[key]):
+                ErrorHandler.exit_with_error(ERR_SYNTAX, "Invalid type")
+            if operand == OP_LABEL and not Validators.is_label(destructured_line[key]):
+                ErrorHandler.exit_with_error(ERR_SYNTAX, "Invalid label")
 
             self.operands.append(Operand(destructured_line[key], operand))
 
-        self.order = Instruction.general_order
-        Instruction.general_order += 1
-
     def get_name(self):
         return self.name.upper()
 
@@ -221,42 +185,36 @@ class InputAnalyser:
 
     def get_instructions(self):
         if len(self.input) == 0:
-            ErrorHandler.exit_with_error(ErrorCodes.ERR_HEADER, "invalid header")
+            ErrorHandler.exit_with_error(ERR_HEADER, "invalid header")
         if not Validators.is_header(self.input[0]):
-            ErrorHandler.exit_with_error(ErrorCodes.ERR_HEADER, "invalid header")
+            ErrorHandler.exit_with_error(ERR_HEADER, "invalid header")
 
         del self.input[0]
 
-        for line in self.input:
-            self.instructions.append(Instruction(re.split(r"\s+", line)))
+        for order, line in enumerate(self.input, start=1):
+            self.instructions.append(Instruction(line.split(), order))
 
         return self.instructions
 
 class XMLGenerator:
-    def __init__(self):
-        self.output = ""
-        self.program = ""
-
     def generate_instruction(self, instruction):
+        operands_template = "".join(
+            f"<arg{key+1} type=\"{operand.type}\">{operand.value.translate(XML_ESCAPE)}</arg{key+1}>"
+            for key, operand in enumerate(instruction.get_operands())
+        )
         instruction_template = f"<instruction order=\"{instruction.get_order()}\" opcode=\"{instruction.get_name()}\">"
-        for key, operand in enumerate(instruction.get_operands()):
-            operand_template = f"<arg{key+1} type=\"{operand.type}\">{operand.value}</arg{key+1}>"
-            instruction_template += operand_template
-        instruction_template += "</instruction>"
-        self.program += instruction_template
+        return f"{instruction_template}{operands_template}</instruction>"
 
     def generate(self, instructions):
+        # Instructions are already validated, so the XML is written out as it is generated
+        write = sys.stdout.write
+        write("<program language=\"IPPcode23\">")
         for instruction in instructions:
-            self.generate_instruction(instruction)
-        self.output = f"<program language=\"IPPcode23\">{self.program}</program>"
-        return self.output
+            write(self.generate_instruction(instruction))
+        write("</program>\n")
 
 class OutputGenerator(XMLGenerator):
-    def generate(self, instructions):
-        for instruction in instructions:
-            self.generate_instruction(instruction)
-        self.output = f"<program language=\"IPPcode23\">{self.program}</program>"
-        return self.output
+    pass
 
 if __name__ == "__main__":
     shortopts = "h"
@@ -265,7 +223,7 @@ if __name__ == "__main__":
     try:
         opts, args = getopt.getopt(sys.argv[1:], shortopts, longopts)
     except getopt.GetoptError:
-        ErrorHandler.exit_with_error(ErrorCodes.ERR_PARAMETER, "Invalid options")
+        ErrorHandler.exit_with_error(ERR_PARAMETER, "Invalid options")
 
     if len(opts) == 1 and ("-h", "") in opts:
         print("\n   Welcome to IPPCode23 parser!\n"
@@ -274,7 +232,7 @@ if __name__ == "__main__":
               "\n   Usage: python parser.py [options] < [file]\n"
               "\n   Default options:\n"
               "     --help or -h\tprints help info\n")
-        sys.exit(ErrorCodes.EXIT_SUCCESS.value)
+        sys.exit(EXIT_SUCCESS)
 
     reader = InputReader()
     input_lines = reader.get_input()
@@ -283,7 +241,6 @@ if __name__ == "__main__":
     instructions = inputAnalyser.get_instructions()
 
     output_generator = OutputGenerator()
-    output = output_generator.generate(instructions)
+    output_generator.generate(instructions)
 
-    print(output)
-    sys.exit(ErrorCodes.EXIT_SUCCESS.value)
+    sys.exit(EXIT_SUCCESS)
@@ -0,0 +1,53 @@
+import sys
+
+
+# Enum for argument types, interned so that comparing them short-circuits on identity
+class E_ARG_TYPE:
+    VAR = sys.intern('var')
+    INT = sys.intern('int')
+    BOOL = sys.intern('bool')
+    STRING = sys.intern('string')
+    NIL = sys.intern('nil')
+    LABEL = sys.intern('label')
+    TYPE = sys.intern('type')
+    SYMB = sys.intern('symb')
+
+
+# Dictionary to store predefined commands with their expected argument types
+CODE_COMMANDS = {
+    'MOVE': (E_ARG_TYPE.VAR, E_ARG_TYPE.SYMB),
+    'CREATEFRAME': (),
+    'PUSHFRAME': (),
+    'POPFRAME': (),
+    'DEFVAR': (E_ARG_TYPE.VAR,),
+    'CALL': (E_ARG_TYPE.LABEL,),
+    'RETURN': (),
+    'PUSHS': (E_ARG_TYPE.SYMB,),
+    'POPS': (E_ARG_TYPE.VAR,),
+    'ADD': (E_ARG_TYPE.VAR, E_ARG_TYPE.SYMB, E_ARG_TYPE.SYMB),
+    'SUB': (E_ARG_TYPE.VAR, E_ARG_TYPE.SYMB, E_ARG_TYPE.SYMB),
+    'MUL': (E_ARG_TYPE.VAR, E_ARG_TYPE.SYMB, E_ARG_TYPE.SYMB),
+    'IDIV': (E_ARG_TYPE.VAR, E_ARG_TYPE.SYMB, E_ARG_TYPE.SYMB),
+    'LT': (E_ARG_TYPE.VAR, E_ARG_TYPE.SYMB, E_ARG_TYPE.SYMB),
+    'GT': (E_ARG_TYPE.VAR, E_ARG_TYPE.SYMB, E_ARG_TYPE.SYMB),
+    'EQ': (E_ARG_TYPE.VAR, E_ARG_TYPE.SYMB, E_ARG_TYPE.SYMB),
+    'AND': (E_ARG_TYPE.VAR, E_ARG_TYPE.SYMB, E_ARG_TYPE.SYMB),
+    'OR': (E_ARG_TYPE.VAR, E_ARG_TYPE.SYMB, E_ARG_TYPE.SYMB),
+    'NOT': (E_ARG_TYPE.VAR, E_ARG_TYPE.SYMB),
+    'INT2CHAR': (E_ARG_TYPE.VAR, E_ARG_TYPE.SYMB),
+    'STRI2INT': (E_ARG_TYPE.VAR, E_ARG_TYPE.SYMB, E_ARG_TYPE.SYMB),
+    'READ': (E_ARG_TYPE.VAR, E_ARG_TYPE.TYPE),
+    'WRITE': (E_ARG_TYPE.SYMB,),
+    'CONCAT': (E_ARG_TYPE.VAR, E_ARG_TYPE.SYMB, E_ARG_TYPE.SYMB),
+    'STRLEN': (E_ARG_TYPE.VAR, E_ARG_TYPE.SYMB),
+    'GETCHAR': (E_ARG_TYPE.VAR, E_ARG_TYPE.SYMB, E_ARG_TYPE.SYMB),
+    'SETCHAR': (E_ARG_TYPE.VAR, E_ARG_TYPE.SYMB, E_ARG_TYPE.SYMB),
+    'TYPE': (E_ARG_TYPE.VAR, E_ARG_TYPE.SYMB),
+    'LABEL': (E_ARG_TYPE.LABEL,),
+    'JUMP': (E_ARG_TYPE.LABEL,),
+    'JUMPIFEQ': (E_ARG_TYPE.LABEL, E_ARG_TYPE.SYMB, E_ARG_TYPE.SYMB),
+    'JUMPIFNEQ': (E_ARG_TYPE.LABEL, E_ARG_TYPE.SYMB, E_ARG_TYPE.SYMB),
+    'EXIT': (E_ARG_TYPE.SYMB,),
+    'DPRINT': (E_ARG_TYPE.SYMB,),
+    'BREAK': ()
+}
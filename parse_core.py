@@ -0,0 +1,242 @@
+import re
+import sys
+from functools import lru_cache
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, cast
+
+from opcodes import CODE_COMMANDS, E_ARG_TYPE
+
+
+ERROR_HEADER = 21
+ERROR_SYNTAX = 22
+ERROR_OTHER_SYNTAX = 23
+ERROR_OPEN_FILE = 11
+
+# Header that has to be the first line of the source code
+HEADER = '.IPPcode24'
+
+# Parsed instruction, the opcode followed by its arguments and their recognized types
+Instruction = Tuple[str, List[str], List[str]]
+
+
+# Regular expression for a valid variable name
+VAR_NAME_REGEX = re.compile(r'^[a-z-A-Z_\-$&%*!?][\w_\-$&%*!?]*$')
+# Regular expression for a decimal, octal or hexadecimal integer literal
+INTEGER_REGEX = re.compile(r'^(?:[+-]?\d+|0[oO][0-7]+|0[xX][0-9a-fA-F]+)$')
+# Length of the type prefix removed from each kind of constant in the XML output
+CONST_PREFIX_LENGTHS = {
+    E_ARG_TYPE.INT: len('int@'),
+    E_ARG_TYPE.BOOL: len('bool@'),
+    E_ARG_TYPE.STRING: len('string@'),
+    E_ARG_TYPE.NIL: len('nil@'),
+}
+# Names accepted as a type argument
+TYPE_NAMES = frozenset(('int', 'bool', 'string'))
+# Values of boolean constants
+BOOL_VALUES = frozenset(('true', 'false'))
+# Argument types accepted where a symbol is expected
+SYMB_TYPES = frozenset((E_ARG_TYPE.STRING, E_ARG_TYPE.INT, E_ARG_TYPE.BOOL, E_ARG_TYPE.NIL, E_ARG_TYPE.VAR))
+# Translation table escaping characters that are not allowed in XML text
+XML_ESCAPE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
+
+
+def check_header(tokens: List[str]) -> None:
+    if not tokens:
+        print('Empty input', file=sys.stderr)
+        sys.exit(ERROR_HEADER)
+
+    if tokens != [HEADER]:
+        print('Wrong header:', ' '.join(tokens), file=sys.stderr)
+        sys.exit(ERROR_HEADER)
+
+
+def check_single_opcode(tokens: List[str]) -> None:
+    # The first token is the opcode, look for another one among the arguments. Tokens
+    # containing '@' are variables or constants and cannot be opcodes, so they skip upper()
+    if any('@' not in token and token.upper() in CODE_COMMANDS for token in tokens[1:]):
+        print("Error: More than one opcode found in the line:", ' '.join(tokens), file=sys.stderr)
+        sys.exit(ERROR_OTHER_SYNTAX)
+
+
+def validate_variable_name(var: str) -> bool:
+    """
+    Validate a variable name according to the specified rules.
+    Returns True if the variable name is valid, False otherwise.
+    """
+    return bool(VAR_NAME_REGEX.match(var))
+
+
+def is_valid_integer(value: str) -> bool:
+    # Check if the value matches any of the integer formats
+    return bool(INTEGER_REGEX.match(value))
+
+
+def is_valid_bool(value: str) -> bool:
+    # Check if the boolean value is either 'true' or 'false'
+    return value in BOOL_VALUES
+
+
+def is_valid_nil(value: str) -> bool:
+    # Check if the value is 'nil'
+    return value == 'nil'
+
+
+def is_valid_string(value: str) -> bool:
+    # Any string constant is accepted
+    return True
+
+
+# Dictionary mapping the prefix before '@' to the argument type, its validator and error message
+ARG_PREFIXES = {
+    'GF': (E_ARG_TYPE.VAR, validate_variable_name, 'Invalid variable name:'),
+    'LF': (E_ARG_TYPE.VAR, validate_variable_name, 'Invalid variable name:'),
+    'TF': (E_ARG_TYPE.VAR, validate_variable_name, 'Invalid variable name:'),
+    'int': (E_ARG_TYPE.INT, is_valid_integer, 'Invalid integer format:'),
+    'bool': (E_ARG_TYPE.BOOL, is_valid_bool, 'Invalid boolean format:'),
+    'string': (E_ARG_TYPE.STRING, is_valid_string, 'Invalid string format:'),
+    'nil': (E_ARG_TYPE.NIL, is_valid_nil, 'Invalid nil format:'),
+}
+
+
+# Arguments repeat heavily across a program, so the results are memoized
+@lru_cache(maxsize=4096)
+def recognize_arg_type(arg: str) -> Optional[str]:
+    prefix, at, value = arg.partition('@')
+
+    # Arguments without a prefix are type names or labels
+    if not at:
+        if arg in TYPE_NAMES:
+            return E_ARG_TYPE.TYPE
+        elif validate_variable_name(arg):
+            return E_ARG_TYPE.LABEL
+        else:
+            return None
+
+    kind = ARG_PREFIXES.get(prefix)
+    if kind is None:
+        return None
+
+    arg_type, validator, error_message = kind
+    if validator(value):
+        return arg_type
+    else:
+        print(error_message, arg, file=sys.stderr)
+        sys.exit(ERROR_OTHER_SYNTAX)
+
+
+def check_type(arg: str, arg_type: Optional[str], expected_type: str) -> None:
+    if arg_type != expected_type:
+        # Check if the arg is a constant or a variable and the expected type is SYMB
+        if expected_type == E_ARG_TYPE.SYMB and arg_type in SYMB_TYPES:
+            return  # Allow constants and variables to satisfy the SYMB requirement
+        else:
+            print('Wrong argument type:', arg, file=sys.stderr)
+            sys.exit(ERROR_OTHER_SYNTAX)
+
+
+def check_number_of_args(tokens: List[str], expected_types: Tuple[str, ...]) -> None:
+    if len(tokens) - 1 != len(expected_types):
+        print('Wrong arguments number:', ' '.join(tokens), file=sys.stderr)
+        sys.exit(ERROR_OTHER_SYNTAX)
+
+
+def parse_code(input_lines: Iterable[str]) -> Iterator[Instruction]:
+    # Flag to indicate if the header line has been checked
+    header_checked = False
+
+    # Tokenize and parse each line, yielding instructions as they are parsed
+    for line in input_lines:
+        tokens = tokenize_line(line)
+
+        # Skip empty lines
+        if not tokens:
+            continue
+
+        # The first program line has to be the header
+        if not header_checked:
+            check_header(tokens)
+            header_checked = True
+            continue
+
+        yield parse_instruction(tokens)
+
+    # Input without any program line is missing the header
+    if not header_checked:
+        check_header([])
+
+
+def tokenize_line(line: str) -> List[str]:
+    # Cut the comment off and split the rest of the line on runs of whitespace
+    return line.partition('#')[0].split()
+
+
+def parse_instruction(tokens: List[str]) -> Instruction:
+    # Convert the opcode to uppercase, interned as it is emitted for every instruction
+    opcode = sys.intern(tokens[0].upper())
+
+    # Look up the expected argument types once, unknown opcodes have none
+    expected_types = CODE_COMMANDS.get(opcode)
+    if expected_types is None:
+        sys.exit(ERROR_SYNTAX)
+
+    # Check if the line contains only one opcode
+    check_single_opcode(tokens)
+
+    # Check if the number of arguments is correct
+    check_number_of_args(tokens, expected_types)
+
+    # The number of arguments is known, so they are kept without padding
+    args = tokens[1:]
+
+    # Recognize arg type for each arg and place it in args_type array
+    arg_types = [recognize_arg_type(arg) for arg in args]
+
+    # Check argument types against the expected ones
+    for arg, arg_type, expected_type in zip(args, arg_types, expected_types):
+        check_type(arg, arg_type, expected_type)
+
+    # The arguments and their types are kept as two parallel lists,
+    # unrecognized (None) types have been rejected by check_type
+    return opcode, args, cast(List[str], arg_types)
+
+
+def format_arg_text(arg: str, arg_type: str) -> str:
+    # Constants lose their type prefix, other arguments are kept as they are
+    return arg[CONST_PREFIX_LENGTHS.get(arg_type, 0):].translate(XML_ESCAPE)
+
+
+def make_emitter(opcode: str, arg_types: Tuple[str, ...]) -> Callable[..., str]:
+    # The emitter formats the order, followed by the texts of the arguments and then their types
+    if not arg_types:
+        return f'  <instruction order="{{0}}" opcode="{opcode}" />\n'.format
+
+    arity = len(arg_types)
+    args_template = ''.join(
+        f'    <arg{number} type="{{{arity + number}}}">{{{number}}}</arg{number}>\n'
+        for number in range(1, arity + 1)
+    )
+    return (f'  <instruction order="{{0}}" opcode="{opcode}">\n' + args_template + '  </instruction>\n').format
+
+
+# Emitters specialized for the number of arguments of each opcode
+EMITTERS = {opcode: make_emitter(opcode, arg_types) for opcode, arg_types in CODE_COMMANDS.items()}
+
+
+def format_instruction(order: int, instruction: Instruction) -> str:
+    opcode, args, arg_types = instruction
+
+    return EMITTERS[opcode](order, *map(format_arg_text, args, arg_types), *arg_types)
+
+
+def generate_xml(instructions: Iterable[Instruction]) -> None:
+    # Format the instructions one by one as they are parsed
+    instructions_xml = ''.join(
+        format_instruction(order, instruction) for order, instruction in enumerate(instructions, 1)
+    )
+
+    xml_string = "<?xml version='1.0' encoding='utf-8'?>\n"
+    if instructions_xml:
+        xml_string += '<program language="IPPcode24">\n' + instructions_xml + '</program>'
+    else:
+        xml_string += '<program language="IPPcode24" />'
+    # Write the document at once, encoded as its declaration states
+    sys.stdout.buffer.write((xml_string + '\n').encode('utf-8'))
@@ -0,0 +1,16 @@
+# Optional native build of the parser core:
+#   python setup.py build_ext --inplace
+# Python prefers the compiled extension over parse_core.py, so parse.py
+# uses it automatically once it is built and falls back to the pure
+# Python module when it is not.
+# parse_core.py is fully type annotated, so it can be compiled with mypyc
+# instead, which picks up the annotations:
+#   mypyc parse_core.py
+from setuptools import setup
+from Cython.Build import cythonize
+
+
+setup(
+    name='ipp-parse',
+    ext_modules=cythonize('parse_core.py', compiler_directives={'language_level': 3}),
+)